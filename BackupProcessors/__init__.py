@@ -45,6 +45,9 @@ class BackupProcessorFactory:
     """
     Factory pour détecter automatiquement le type de backup et utiliser
     le bon processor.
+
+    L'en-tête du fichier est lu une seule fois puis transmis à chaque
+    processor, qui détecte son format par signature sans rouvrir le fichier.
     """
 
     def __init__(self):
@@ -65,11 +68,21 @@ class BackupProcessorFactory:
         Returns:
             Processor compatible ou None si aucun trouvé
         """
+        head = self._read_head(file_path)
+
         for processor in self._processors:
-            if processor.can_process(file_path):
+            if processor.can_process(file_path, head=head):
                 return processor
         return None
 
+    def _read_head(self, file_path: str) -> Optional[bytes]:
+        """Lit les premiers octets du fichier, une fois par détection."""
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(BaseBackupProcessor._SNIFF_SIZE)
+        except OSError:
+            return None
+
     def process_backup(self, file_path: str) -> List[Union[TOTPEntry, HOTPEntry]]:
         """
         Traite automatiquement un backup en détectant son format.
@@ -88,7 +101,12 @@ class BackupProcessorFactory:
         if processor is None:
             raise UnsupportedFormatError("Format non reconnu", file_path)
 
-        return processor.process_backup(file_path)
+        # Archives ouvertes et documents décodés pendant la détection sont
+        # libérés dès le traitement terminé, sans attendre le ramasse-miettes
+        try:
+            return processor.process_backup(file_path)
+        finally:
+            processor.close()
 
     def get_supported_apps(self) -> List[str]:
         """Retourne la liste des applications supportées."""
@@ -6,7 +6,7 @@ tous les processors spécialisés pour assurer une utilisation uniforme.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Optional
 from OTPTools import TOTPEntry, HOTPEntry
 
 
@@ -18,6 +18,9 @@ class BaseBackupProcessor(ABC):
     pour assurer une utilisation uniforme.
     """
 
+    # Taille de l'en-tête lu pour la détection par signature (can_process)
+    _SNIFF_SIZE = 4096
+
     @property
     @abstractmethod
     def supported_formats(self) -> List[str]:
@@ -31,12 +34,14 @@ class BaseBackupProcessor(ABC):
         pass
 
     @abstractmethod
-    def can_process(self, file_path: str) -> bool:
+    def can_process(self, file_path: str, head: Optional[bytes] = None) -> bool:
         """
         Vérifie si ce processor peut traiter le fichier donné.
 
         Args:
             file_path: Chemin vers le fichier de backup
+            head: Premiers octets du fichier, déjà lus par l'appelant (optionnel).
+                  Permet une détection par signature sans rouvrir le fichier.
 
         Returns:
             True si le fichier peut être traité
@@ -70,3 +75,10 @@ class BaseBackupProcessor(ABC):
             Dictionnaire avec les métadonnées (nombre d'entrées, version, etc.)
         """
         return {}
+
+    def close(self) -> None:
+        """
+        Libère les ressources gardées entre détection et traitement (optionnel).
+
+        Appelé une fois le backup traité; le processor reste utilisable.
+        """
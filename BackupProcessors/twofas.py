@@ -7,28 +7,137 @@ supportant différents formats (JSON, ZIP) et structures de données.
 
 import json
 import logging
+import mmap
+import os
+import re
 import sys
 import zipfile
 from pathlib import Path
-from typing import List, Union, Dict, Any, Optional, Tuple
+from typing import List, Union, Dict, Any, Iterator, Optional, Tuple
 
-from base64 import b64decode
 from binascii import Error as BinasciiError
 from getpass import getpass
-import hashlib
 
 from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+# orjson (optionnel) accélère le décodage; ses erreurs héritent de
+# json.JSONDecodeError, ce qui garde une gestion d'erreur unique.
+try:
+    from orjson import loads as _json_loads
+
+    _JSON_LOADS_BUFFERS = True  # accepte aussi memoryview (lecture via mmap)
+except ImportError:
+    from json import loads as _json_loads
+
+    _JSON_LOADS_BUFFERS = False
+
+# Taille à partir de laquelle un fichier JSON est projeté en mémoire (mmap)
+_MMAP_THRESHOLD = 1 << 20
+
+# pybase64 (optionnel) décode en SIMD; même signature et mêmes erreurs
+# (binascii.Error) que base64.b64decode.
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
 
 from .base import BaseBackupProcessor
 from .exceptions import UnsupportedFormatError, CorruptedBackupError
 from OTPTools import TOTPEntry, HOTPEntry
 from OTPTools.factory import OTPFactory
-from OTPTools.exceptions import OTPError, ParseError
+from OTPTools.exceptions import OTPError
 
 
 logger = logging.getLogger(__name__)
 
+# Structure `data:salt:iv` en base64 standard, validée en une seule passe
+_ENCRYPTED_BLOB_RE = re.compile(
+    r"(?:[A-Za-z0-9+/]*={0,2}:){2}[A-Za-z0-9+/]*={0,2}"
+)
+
+
+def _classify_payload(data: Any) -> Tuple[str, List[Any]]:
+    """Identifie la forme d'un document 2FAS et les services qu'il contient.
+
+    Returns:
+        (forme, services) avec forme parmi "services", "entries",
+        "encrypted", "direct" (service isolé), "list" ou "invalid".
+        Pour un contenu invalide, les services sont ceux qu'une extraction
+        tenterait malgré tout: chaque rejet y est alors journalisé.
+    """
+    # Les décodeurs JSON ne produisent jamais de sous-classes de dict/list
+    data_type = type(data)
+
+    if data_type is dict:
+        if "services" in data:
+            return "services", data["services"]
+        if "entries" in data:
+            return "entries", data["entries"]
+        if "servicesEncrypted" in data:
+            return "encrypted", [data]
+        if "secret" in data:
+            return "direct", [data]
+        return "invalid", [data]
+
+    if data_type is list:
+        if data and type(data[0]) is dict and "secret" in data[0]:
+            return "list", data
+        return "invalid", data
+
+    return "invalid", []
+
+
+def _advise(fd: int, advice_name: str) -> None:
+    """Transmet un conseil de lecture au noyau (posix_fadvise), si supporté."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _load_json_file(json_path: Path) -> Any:
+    """Décode un fichier JSON, projeté en mémoire s'il est volumineux."""
+    with open(json_path, "rb") as f:
+        # Lecture intégrale et séquentielle: lecture anticipée plus agressive
+        _advise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+        size = os.fstat(f.fileno()).st_size
+
+        # Évite la copie complète du fichier quand le décodeur accepte
+        # un buffer; les petits fichiers restent en lecture simple
+        if _JSON_LOADS_BUFFERS and size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return _json_loads(view)
+
+        return _json_loads(f.read())
+
+
+def _report_rejected_service(service: Any, error: Exception) -> None:
+    """Journalise un service 2FAS qui n'a pas pu être converti en entrée OTP."""
+    if isinstance(error, OTPError):
+        if not isinstance(service, dict):
+            return
+        service_name = service.get("name", "service inconnu")
+        logger.warning(
+            "Erreur lors de la création OTP pour %s: %s", service_name, error
+        )
+        return
+
+    service_name = (
+        service.get("name", "service inconnu")
+        if isinstance(service, dict)
+        else "service inconnu"
+    )
+    logger.error(
+        "Erreur inattendue pour %s: %s", service_name, error, exc_info=error
+    )
+
 
 class TwoFASProcessor(BaseBackupProcessor):
     """Processor pour les backups 2FAS Android.
@@ -43,37 +152,95 @@ class TwoFASProcessor(BaseBackupProcessor):
     _PBKDF2_KEY_LENGTH = 32
     _MAX_PASSWORD_ATTEMPTS = 3
 
+    # Extensions supportées, dans l'ordre exposé par supported_formats, et
+    # ensemble dérivé pour les tests d'appartenance
+    _FORMATS = (".2fas", ".zip", ".json")
+    _SUPPORTED_FORMATS = frozenset(_FORMATS)
+
+    # Détection rapide: clés caractéristiques 2FAS dans l'en-tête lu
+    # (_SNIFF_SIZE octets, défini par BaseBackupProcessor)
+    _SNIFF_SIGNATURES = (
+        b'"services"',
+        b'"servicesEncrypted"',
+        b'"schemaVersion"',
+        b'"entries"',
+        b'"secret"',
+    )
+
+    # Membres ZIP écartés sans décompression: taille du plus petit document
+    # JSON pouvant contenir une clé 2FAS ({"secret":0})
+    _MIN_MEMBER_SIZE = 12
+
     def __init__(self) -> None:
         self._cached_password: Optional[str] = None
+        # Clés dérivées par (mot de passe, sel): PBKDF2 n'est calculé qu'une fois
+        self._key_cache: Dict[Tuple[str, bytes], bytes] = {}
+        self._cipher_cache: Dict[bytes, AESGCM] = {}
+        # Archives ouvertes par (chemin, mtime, taille) avec leurs membres JSON:
+        # le répertoire central n'est lu qu'une fois entre détection et traitement
+        self._zip_cache: Dict[
+            Tuple[str, int, int], Tuple[zipfile.ZipFile, List[str]]
+        ] = {}
+        # Membres JSON décodés par (archive, mtime, membre), partagés entre
+        # can_process et process_backup
+        self._member_cache: Dict[Tuple[str, int, str], Any] = {}
+        # Fichiers JSON décodés par can_process, par (chemin, mtime, taille):
+        # repris puis libérés par process_backup
+        self._parsed_cache: Dict[Tuple[str, int, int], Any] = {}
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Ferme les archives ZIP en cache et libère les documents décodés."""
+        for zip_file, _ in getattr(self, "_zip_cache", {}).values():
+            zip_file.close()
+        self._zip_cache = {}
+        self._member_cache = {}
+        self._parsed_cache = {}
 
     @property
     def supported_formats(self) -> List[str]:
-        return [".2fas", ".zip", ".json"]
+        return list(self._FORMATS)
 
     @property
     def app_name(self) -> str:
         return "2FAS"
 
-    def can_process(self, file_path: str) -> bool:
-        """Vérifie si le fichier est un backup 2FAS valide."""
-        path = Path(file_path)
+    def can_process(self, file_path: str, head: Optional[bytes] = None) -> bool:
+        """Vérifie si le fichier est un backup 2FAS valide.
 
-        if not path.exists():
-            return False
+        `head` (premiers octets déjà lus, ex: par la factory) évite de relire
+        l'en-tête du fichier.
+        """
+        path = Path(file_path)
 
-        # Vérification par extension
-        if path.suffix.lower() not in self.supported_formats:
+        # Vérification par extension (un fichier absent est écarté par
+        # l'ouverture elle-même, sans appel préalable à exists())
+        suffix = path.suffix.lower()
+        if suffix not in self._SUPPORTED_FORMATS:
             return False
 
         try:
-            # Vérification du contenu pour les JSON
-            if path.suffix.lower() in [".2fas", ".json"]:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return self._is_valid_2fas_format(data)
+            # Vérification du contenu pour les JSON: lecture de l'en-tête seul
+            if suffix in (".2fas", ".json"):
+                if head is None:
+                    if self._quick_sniff_2fas(path):
+                        return True
+                elif self._has_2fas_signature(head):
+                    return True
+
+                # Aucune clé caractéristique dans l'en-tête (ex: service dont
+                # le secret n'apparaît qu'au-delà): repli sur la validation
+                # complète, dont le décodage est partagé avec process_backup
+                self._load_and_validate(path)
+                return True
 
             # Vérification pour les ZIP
-            elif path.suffix.lower() == ".zip":
+            elif suffix == ".zip":
+                # Signature ZIP ("PK") absente: inutile d'ouvrir l'archive
+                if head is not None and not head.startswith(b"PK"):
+                    return False
                 return self._is_valid_2fas_zip(path)
 
         except Exception:
@@ -81,51 +248,95 @@ class TwoFASProcessor(BaseBackupProcessor):
 
         return False
 
-    def _is_valid_2fas_format(self, data: Dict) -> bool:
+    def _quick_sniff_2fas(self, path: Path) -> bool:
+        """Détecte un backup 2FAS à partir des premiers octets du fichier."""
+        with open(path, "rb") as f:
+            found = self._has_2fas_signature(f.read(self._SNIFF_SIZE))
+            if found:
+                # Le fichier sera lu en entier par process_backup: le noyau
+                # peut le charger en cache dès maintenant
+                _advise(f.fileno(), "POSIX_FADV_WILLNEED")
+            return found
+
+    def _has_2fas_signature(self, head: bytes) -> bool:
+        """Recherche une clé caractéristique 2FAS dans un en-tête brut."""
+        return any(signature in head for signature in self._SNIFF_SIGNATURES)
+
+    def _is_valid_2fas_format(self, data: Any) -> bool:
         """Vérifie si les données JSON correspondent au format 2FAS."""
-        # Vérification basique de la structure
-        if isinstance(data, dict):
-            if "services" in data or "entries" in data:
-                return True
-            # Peut-être que le dictionnaire représente directement un service
-            if "secret" in data:
-                return True
-
-        if isinstance(data, list) and data:
-            first_item = data[0]
-            if isinstance(first_item, dict) and "secret" in first_item:
-                return True
-
-        return False
+        return _classify_payload(data)[0] != "invalid"
 
     def _is_valid_2fas_zip(self, zip_path: Path) -> bool:
         """Vérifie si l'archive ZIP contient un backup 2FAS."""
         try:
-            with zipfile.ZipFile(zip_path, "r") as zip_file:
-                # Recherche de fichiers JSON dans l'archive
-                json_files = [f for f in zip_file.namelist() if f.endswith(".json")]
-
-                for json_file in json_files:
-                    with zip_file.open(json_file) as f:
-                        data = json.load(f)
-                        if self._is_valid_2fas_format(data):
-                            return True
+            zip_file, json_files = self._open_zip(zip_path)
+
+            # Les plus petits membres d'abord: un backup valide est trouvé
+            # sans décompresser un gros fichier sans rapport
+            json_files = sorted(
+                json_files, key=lambda name: zip_file.getinfo(name).file_size
+            )
+
+            # Seul l'en-tête de chaque membre est lu; arrêt au premier trouvé.
+            # La validation complète du contenu est laissée à process_backup.
+            for json_file in json_files:
+                with zip_file.open(json_file) as f:
+                    if self._has_2fas_signature(f.read(self._SNIFF_SIZE)):
+                        return True
+
+            # Aucun en-tête caractéristique: repli sur la validation complète
+            for json_file in json_files:
+                data = self._load_zip_member(zip_path, json_file)
+                if self._is_valid_2fas_format(data):
+                    return True
         except Exception:
             return False
 
         return False
 
+    def _open_zip(self, zip_path: Path) -> Tuple[zipfile.ZipFile, List[str]]:
+        """Retourne l'archive (en cache) et la liste de ses membres JSON."""
+        stat = zip_path.stat()
+        cache_key = (str(zip_path), stat.st_mtime_ns, stat.st_size)
+
+        cached = self._zip_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Une version précédente du même fichier n'est plus utilisable
+        for key in [k for k in self._zip_cache if k[0] == cache_key[0]]:
+            self._zip_cache.pop(key)[0].close()
+        for key in [k for k in self._member_cache if k[0] == cache_key[0]]:
+            del self._member_cache[key]
+
+        zip_file = zipfile.ZipFile(zip_path, "r")
+        # Tri sur les métadonnées du répertoire central, sans décompression:
+        # membres trop petits pour contenir une clé 2FAS. Le nom seul n'écarte
+        # aucun membre, le contenu décide.
+        json_files = [
+            info.filename
+            for info in zip_file.infolist()
+            if info.filename.endswith(".json")
+            and info.file_size >= self._MIN_MEMBER_SIZE
+        ]
+        self._zip_cache[cache_key] = (zip_file, json_files)
+        return zip_file, json_files
+
     def process_backup(self, file_path: str) -> List[Union[TOTPEntry, HOTPEntry]]:
         """Traite un backup 2FAS et retourne les entrées OTP."""
         path = Path(file_path)
 
-        if not path.exists() or path.suffix.lower() not in self.supported_formats:
+        suffix = path.suffix.lower()
+
+        if suffix not in self._SUPPORTED_FORMATS:
             raise UnsupportedFormatError(self.app_name, file_path)
 
         try:
-            if path.suffix.lower() == ".zip":
+            if suffix == ".zip":
                 return self._process_zip_backup(path)
             return self._process_json_backup(path)
+        except FileNotFoundError:
+            raise UnsupportedFormatError(self.app_name, file_path)
         except UnsupportedFormatError:
             raise
         except CorruptedBackupError:
@@ -137,66 +348,114 @@ class TwoFASProcessor(BaseBackupProcessor):
         self, json_path: Path
     ) -> List[Union[TOTPEntry, HOTPEntry]]:
         """Traite un fichier JSON 2FAS."""
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self._load_and_validate(json_path, consume=True)
+        data = self._decrypt_backup_if_needed(data, str(json_path))
+
+        return self._extract_entries_from_data(data)
+
+    def _load_and_validate(self, json_path: Path, consume: bool = False) -> Any:
+        """Décode un fichier JSON et vérifie qu'il s'agit d'un backup 2FAS.
+
+        Args:
+            json_path: Fichier à décoder
+            consume: Retire le document du cache de l'instance (traitement)
+                     au lieu de l'y conserver (détection)
+
+        Raises:
+            UnsupportedFormatError: Si le contenu n'est pas au format 2FAS
+        """
+        data = self._load_json(json_path, consume)
 
         if not self._is_valid_2fas_format(data):
+            # Document écarté: inutile de le garder pour process_backup
+            self._parsed_cache = {
+                key: value
+                for key, value in self._parsed_cache.items()
+                if value is not data
+            }
             raise UnsupportedFormatError(self.app_name, str(json_path))
 
-        data = self._decrypt_backup_if_needed(data, str(json_path))
+        return data
 
-        return self._extract_entries_from_data(data)
+    def _load_json(self, json_path: Path, consume: bool = False) -> Any:
+        """Décode un fichier JSON, une seule fois entre détection et traitement.
+
+        Le document décodé par can_process est gardé par l'instance pour
+        process_backup (consume=True), qui le retire du cache: il n'est pas
+        conservé au-delà de son traitement.
+        """
+        stat = json_path.stat()
+        cache_key = (str(json_path), stat.st_mtime_ns, stat.st_size)
+
+        if consume:
+            if cache_key in self._parsed_cache:
+                return self._parsed_cache.pop(cache_key)
+            return _load_json_file(json_path)
+
+        if cache_key not in self._parsed_cache:
+            # Une version précédente du même fichier n'est plus utilisable
+            for key in [k for k in self._parsed_cache if k[0] == cache_key[0]]:
+                del self._parsed_cache[key]
+            self._parsed_cache[cache_key] = _load_json_file(json_path)
+        return self._parsed_cache[cache_key]
+
+    def _load_zip_member(self, zip_path: Path, json_file: str) -> Any:
+        """Décode un membre JSON d'une archive, une seule fois par version."""
+        zip_file, _ = self._open_zip(zip_path)
+        cache_key = (str(zip_path), zip_path.stat().st_mtime_ns, json_file)
+
+        if cache_key not in self._member_cache:
+            self._member_cache[cache_key] = _json_loads(zip_file.read(json_file))
+        return self._member_cache[cache_key]
 
     def _process_zip_backup(self, zip_path: Path) -> List[Union[TOTPEntry, HOTPEntry]]:
         """Traite une archive ZIP 2FAS."""
         entries = []
         found_valid_data = False
 
-        with zipfile.ZipFile(zip_path, "r") as zip_file:
-            json_files = [f for f in zip_file.namelist() if f.endswith(".json")]
+        _, json_files = self._open_zip(zip_path)
 
-            for json_file in json_files:
-                with zip_file.open(json_file) as f:
-                    data = json.load(f)
-                    if self._is_valid_2fas_format(data):
-                        found_valid_data = True
-                        source = f"{zip_path}!/{json_file}"
-                        data = self._decrypt_backup_if_needed(data, source)
-                        entries.extend(self._extract_entries_from_data(data))
+        for json_file, data in self._iter_zip_members(zip_path, json_files):
+            if self._is_valid_2fas_format(data):
+                found_valid_data = True
+                source = f"{zip_path}!/{json_file}"
+                data = self._decrypt_backup_if_needed(data, source)
+                entries.extend(self._extract_entries_from_data(data))
 
         if not found_valid_data:
             raise UnsupportedFormatError(self.app_name, str(zip_path))
 
         return entries
 
+    def _iter_zip_members(
+        self, zip_path: Path, json_files: List[str]
+    ) -> Iterator[Tuple[str, Any]]:
+        """Produit (membre, document décodé) dans l'ordre de l'archive.
+
+        Les membres déjà décodés par can_process sont retirés du cache au
+        passage: seul le document en cours de traitement reste en mémoire.
+        """
+        zip_file, _ = self._open_zip(zip_path)
+        zip_key = (str(zip_path), zip_path.stat().st_mtime_ns)
+
+        # Lecture séquentielle: un membre n'est décompressé qu'une fois le
+        # précédent traité
+        for json_file in json_files:
+            cache_key = (*zip_key, json_file)
+            if cache_key in self._member_cache:
+                yield json_file, self._member_cache.pop(cache_key)
+            else:
+                yield json_file, _json_loads(zip_file.read(json_file))
+
     def _extract_entries_from_data(
-        self, data: Dict
+        self, data: Any
     ) -> List[Union[TOTPEntry, HOTPEntry]]:
         """Extrait les entrées OTP des données JSON 2FAS."""
-        entries = []
-
-        # Gestion des différents formats 2FAS
-        services = []
-
-        if isinstance(data, dict):
-            if "services" in data:
-                services = data["services"]
-            elif "entries" in data:
-                services = data["entries"]
-            else:
-                # Peut-être que data contient directement les services
-                services = [data]
-        elif isinstance(data, list):
-            services = data
-
-        for service in services:
-            entry = self._create_otp_entry_from_service(service)
-            if entry:
-                entries.append(entry)
-
-        return entries
+        return OTPFactory.create_many_from_2fas(
+            _classify_payload(data)[1], on_error=_report_rejected_service
+        )
 
-    def _is_encrypted_backup(self, data: Dict[str, Any]) -> bool:
+    def _is_encrypted_backup(self, data: Any) -> bool:
         """Détecte si le backup contient des données chiffrées."""
         if not isinstance(data, dict):
             return False
@@ -204,7 +463,12 @@ class TwoFASProcessor(BaseBackupProcessor):
         return isinstance(encrypted, str) and encrypted.strip() != ""
 
     def _decrypt_backup_if_needed(self, data: Any, source: str) -> Any:
-        """Déchiffre un backup 2FAS si nécessaire."""
+        """Déchiffre un backup 2FAS si nécessaire.
+
+        Pour un backup chiffré, retourne directement la liste des services
+        déchiffrés (décodée depuis les octets en clair, sans copie du backup);
+        sinon retourne les données inchangées.
+        """
         if not isinstance(data, dict) or not self._is_encrypted_backup(data):
             return data
 
@@ -227,13 +491,11 @@ class TwoFASProcessor(BaseBackupProcessor):
                     source=source,
                     field_name="servicesEncrypted",
                 )
-                services_payload = json.loads(decrypted_services)
+                services_payload = _json_loads(decrypted_services)
 
-                data_copy = dict(data)
-                data_copy["services"] = services_payload
-                data_copy.pop("servicesEncrypted", None)
-
-                if reference_encrypted:
+                # Le tag GCM de servicesEncrypted authentifie déjà le mot de
+                # passe: la référence n'est vérifiée qu'à titre de diagnostic
+                if reference_encrypted and logger.isEnabledFor(logging.DEBUG):
                     try:
                         self._decrypt_encrypted_blob(
                             reference_encrypted,
@@ -242,7 +504,7 @@ class TwoFASProcessor(BaseBackupProcessor):
                             source=source,
                             field_name="reference",
                         )
-                    except InvalidTag:
+                    except (InvalidTag, CorruptedBackupError):
                         logger.debug(
                             "Mot de passe valide pour les services mais échec pour la référence dans %s",
                             source,
@@ -251,7 +513,7 @@ class TwoFASProcessor(BaseBackupProcessor):
                 if key_encoded is None and password is not None:
                     self._cached_password = password
 
-                return data_copy
+                return services_payload
 
             except InvalidTag:
                 if key_encoded is not None:
@@ -268,7 +530,7 @@ class TwoFASProcessor(BaseBackupProcessor):
 
                 password = self._prompt_for_password(attempts, source)
 
-            except json.JSONDecodeError as exc:
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
                 raise CorruptedBackupError(
                     source, f"Données JSON invalides après déchiffrement: {exc}"
                 )
@@ -301,15 +563,18 @@ class TwoFASProcessor(BaseBackupProcessor):
         key_encoded: Optional[str],
         source: str,
         field_name: str,
-    ) -> str:
-        """Décrypte une structure `data:salt:iv` du backup 2FAS."""
+    ) -> bytes:
+        """Décrypte une structure `data:salt:iv` du backup 2FAS.
+
+        Le texte clair est retourné en octets: le décodeur JSON les accepte
+        directement, sans passer par une chaîne intermédiaire.
+        """
 
         data_bytes, salt, iv = self._split_encrypted_blob(blob, source, field_name)
         key = self._resolve_key(password, key_encoded, salt, source)
 
         try:
-            plaintext = AESGCM(key).decrypt(iv, data_bytes, None)
-            return plaintext.decode("utf-8")
+            return self._get_cipher(key).decrypt(iv, data_bytes, None)
         except InvalidTag:
             raise
         except Exception as exc:
@@ -317,6 +582,13 @@ class TwoFASProcessor(BaseBackupProcessor):
                 source, f"Échec du déchiffrement de {field_name}: {exc}"
             )
 
+    def _get_cipher(self, key: bytes) -> AESGCM:
+        """Retourne l'instance AESGCM associée à une clé, créée une seule fois."""
+        cipher = self._cipher_cache.get(key)
+        if cipher is None:
+            cipher = self._cipher_cache[key] = AESGCM(key)
+        return cipher
+
     def _split_encrypted_blob(
         self,
         blob: str,
@@ -325,17 +597,22 @@ class TwoFASProcessor(BaseBackupProcessor):
     ) -> Tuple[bytes, bytes, bytes]:
         """Convertit la structure encodée en base64 en triplet (data, salt, iv)."""
 
-        parts = blob.strip().split(":") if isinstance(blob, str) else []
+        blob = blob.strip() if isinstance(blob, str) else ""
+        parts = blob.split(":")
 
         if len(parts) != 3:
             raise CorruptedBackupError(
                 source, f"Structure de champ chiffré invalide pour '{field_name}'"
             )
 
+        # Un seul contrôle de l'alphabet pour les trois parties: b64decode n'a
+        # alors plus à revalider chacune d'elles (validate=True)
+        validate = _ENCRYPTED_BLOB_RE.fullmatch(blob) is None
+
         try:
-            data_bytes = b64decode(parts[0], validate=True)
-            salt = b64decode(parts[1], validate=True)
-            iv = b64decode(parts[2], validate=True)
+            data_bytes = b64decode(parts[0], validate=validate)
+            salt = b64decode(parts[1], validate=validate)
+            iv = b64decode(parts[2], validate=validate)
         except (BinasciiError, ValueError) as exc:
             raise CorruptedBackupError(
                 source, f"Encodage base64 invalide pour '{field_name}'"
@@ -375,42 +652,33 @@ class TwoFASProcessor(BaseBackupProcessor):
                 source, "Mot de passe requis pour déchiffrer le backup 2FAS"
             )
 
-        return hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt,
-            self._PBKDF2_ITERATIONS,
-            dklen=self._PBKDF2_KEY_LENGTH,
-        )
+        cache_key = (password, salt)
+        key = self._key_cache.get(cache_key)
 
-    def _create_otp_entry_from_service(
-        self, service: Dict
-    ) -> Optional[Union[TOTPEntry, HOTPEntry]]:
-        """Crée une entrée OTP à partir d'un service 2FAS en utilisant OTPFactory."""
-        if not isinstance(service, dict):
-            return None
+        if key is None:
+            key = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=self._PBKDF2_KEY_LENGTH,
+                salt=salt,
+                iterations=self._PBKDF2_ITERATIONS,
+            ).derive(password.encode("utf-8"))
+            self._key_cache[cache_key] = key
 
-        try:
-            # Délègue entièrement la création à OTPFactory
-            return OTPFactory.create_from_2fas(service)
-        except (OTPError, ParseError) as e:
-            service_name = service.get("name", "service inconnu")
-            logger.warning(
-                "Erreur lors de la création OTP pour %s: %s", service_name, e
-            )
-            return None
-        except Exception as e:
-            service_name = service.get("name", "service inconnu")
-            logger.exception("Erreur inattendue pour %s: %s", service_name, e)
-            return None
+        return key
 
     def get_metadata(self, file_path: str) -> Dict[str, Any]:
         """Extrait les métadonnées du backup 2FAS."""
         try:
             entries = self.process_backup(file_path)
 
-            totp_count = sum(1 for e in entries if isinstance(e, TOTPEntry))
-            hotp_count = sum(1 for e in entries if isinstance(e, HOTPEntry))
+            # Un seul parcours, sur token_type plutôt que isinstance
+            totp_count = hotp_count = 0
+            for entry in entries:
+                token_type = entry.token_type
+                if token_type == "totp":
+                    totp_count += 1
+                elif token_type == "hotp":
+                    hotp_count += 1
 
             return {
                 "app_name": self.app_name,
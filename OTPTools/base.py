@@ -2,15 +2,49 @@
 Classe de base abstraite pour les entrées OTP.
 """
 
-import base64
-import re
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
 from .config import OTPConfig
 from .exceptions import InvalidSecretError, InvalidParameterError
 
+# Base32 alphabet (RFC 4648): table de suppression pour str.translate
+_B32_DELETE = str.maketrans("", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567")
+# Nombres de '=' finaux acceptés par base64.b32decode sur un bloc de 8
+_B32_PADDINGS = frozenset({0, 1, 3, 4, 6})
+
+# Séparateurs retirés des secrets saisis par groupes ("ABCD EFGH", "ABCD-EFGH")
+_SECRET_SEPARATORS = str.maketrans("", "", " -")
+
+# Caractères laissés tels quels par quote(safe="/"): une valeur qui n'en
+# contient pas d'autres n'a pas besoin d'être encodée
+_URL_SAFE_DELETE = str.maketrans(
+    "", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~/"
+)
+
+
+def _quote(value: str, safe: str = "/", encoding=None, errors=None) -> str:
+    """quote() avec raccourci pour les valeurs sans caractère à encoder."""
+    if safe == "/" and not value.translate(_URL_SAFE_DELETE):
+        return value
+    return quote(value, safe, encoding, errors)
+
+
+# Gabarit de l'URL otpauth: type, label et paramètres communs dans l'ordre
+_OTPAUTH_TEMPLATE = "otpauth://%s/%s?secret=%s&issuer=%s&digits=%d&algorithm=%s"
+
+# Valeurs autorisées en ensembles: test d'appartenance par hachage
+_VALID_DIGITS = frozenset(OTPConfig.VALID_DIGITS)
+_VALID_ALGORITHMS = frozenset(OTPConfig.VALID_ALGORITHMS)
+
+# Graphies usuelles des algorithmes, normalisées sans appel à upper()
+_ALGORITHM_NAMES = {
+    variant: name
+    for name in OTPConfig.VALID_ALGORITHMS
+    for variant in (name, name.lower())
+}
+
 
 class OTPEntry(ABC):
     """
@@ -31,6 +65,15 @@ class OTPEntry(ABC):
         InvalidParameterError: Si un paramètre est invalide
     """
 
+    __slots__ = (
+        "issuer",
+        "secret",
+        "account",
+        "digits",
+        "algorithm",
+        "_label",
+    )
+
     def __init__(
         self,
         issuer: str,
@@ -53,7 +96,7 @@ class OTPEntry(ABC):
         self.secret = self._normalize_secret(secret)
         self.account = self._sanitize_string(account) if account else None
         self.digits = int(digits)
-        self.algorithm = algorithm.upper()
+        self.algorithm = _ALGORITHM_NAMES.get(algorithm) or algorithm.upper()
 
         self._validate_common_params()
         self._label = self._generate_label()
@@ -87,8 +130,8 @@ class OTPEntry(ABC):
         """
         if not secret:
             return secret
-        # Supprime espaces et tirets, met en majuscules
-        return secret.upper().replace(" ", "").replace("-", "")
+        # Supprime espaces et tirets en une passe, met en majuscules
+        return secret.translate(_SECRET_SEPARATORS).upper()
 
     def _validate_common_params(self) -> None:
         """
@@ -112,7 +155,7 @@ class OTPEntry(ABC):
             )
 
         # Validation des digits
-        if self.digits not in OTPConfig.VALID_DIGITS:
+        if self.digits not in _VALID_DIGITS:
             raise InvalidParameterError(
                 "digits",
                 self.digits,
@@ -120,14 +163,15 @@ class OTPEntry(ABC):
             )
 
         # Validation de l'algorithme
-        if self.algorithm not in OTPConfig.VALID_ALGORITHMS:
+        if self.algorithm not in _VALID_ALGORITHMS:
             raise InvalidParameterError(
                 "algorithm",
                 self.algorithm,
                 f"L'algorithme doit être dans {OTPConfig.VALID_ALGORITHMS}",
             )
 
-    def _is_valid_base32(self, secret: str) -> bool:
+    @staticmethod
+    def _is_valid_base32(secret: str) -> bool:
         """
         Vérifie si le secret est un base32 valide.
 
@@ -137,21 +181,17 @@ class OTPEntry(ABC):
         Returns:
             True si le secret est valide, False sinon
         """
-        # Base32 alphabet (RFC 4648)
-        base32_pattern = re.compile(r"^[A-Z2-7]+=*$")
-
-        if not base32_pattern.match(secret):
+        # Alphabet: tous les caractères hors padding final sont supprimés
+        # par la table, il ne doit rien rester
+        data = secret.rstrip("=")
+        if not data or data.translate(_B32_DELETE):
             return False
 
-        # Vérification du padding
-        try:
-            # Ajoute le padding si nécessaire
-            padding = (8 - len(secret) % 8) % 8
-            padded_secret = secret + "=" * padding
-            base64.b32decode(padded_secret)
-            return True
-        except Exception:
-            return False
+        # Padding: une fois complété au multiple de 8 (comme avant un
+        # décodage), le nombre de '=' finaux doit être valide. Même verdict
+        # que base64.b32decode, sans décoder.
+        padding = len(secret) - len(data) + (-len(secret) % 8)
+        return padding in _B32_PADDINGS
 
     def _generate_label(self) -> str:
         """
@@ -172,12 +212,12 @@ class OTPEntry(ABC):
     @property
     @abstractmethod
     def token_type(self) -> str:
-        """Type de token (totp ou hotp)."""
+        """Type de token (totp ou hotp), attribut de classe des sous-classes."""
         pass
 
     @abstractmethod
     def _get_specific_params(self) -> Dict[str, str]:
-        """Retourne les paramètres spécifiques au type d'OTP."""
+        """Retourne les paramètres spécifiques au type d'OTP (lecture seule)."""
         pass
 
     @abstractmethod
@@ -195,24 +235,21 @@ class OTPEntry(ABC):
         Returns:
             URL formatée pour génération de QR code
         """
-        base_params = {
-            "secret": self.secret,
-            "issuer": self.issuer,
-            "digits": str(self.digits),
-            "algorithm": self.algorithm,
-        }
-
-        # Ajouter les paramètres spécifiques au type
-        base_params.update(self._get_specific_params())
-
-        # Filtrer les paramètres None
-        params = {k: v for k, v in base_params.items() if v is not None}
-
-        # Construire l'URL avec encodage approprié
-        params_str = "&".join([f"{k}={quote(str(v))}" for k, v in params.items()])
-        encoded_label = quote(self.label)
-
-        return f"otpauth://{self.token_type}/{encoded_label}?{params_str}"
+        # Paramètres communs dans un gabarit de forme fixe (algorithme déjà
+        # validé, donc sans caractère à encoder), puis paramètres spécifiques
+        url = _OTPAUTH_TEMPLATE % (
+            self.token_type,
+            _quote(self._label),
+            _quote(self.secret),
+            _quote(self.issuer),
+            self.digits,
+            self.algorithm,
+        )
+        specific = self._get_specific_params()
+        if specific:
+            url += "&" + urlencode(specific, safe="/", quote_via=_quote)
+
+        return url
 
     def __str__(self) -> str:
         """Représentation textuelle de l'entrée OTP."""
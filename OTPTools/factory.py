@@ -2,7 +2,7 @@
 Factory pour créer des entrées OTP à partir de différentes sources.
 """
 
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import urllib.parse
 
 from .totp import TOTPEntry
@@ -11,6 +11,119 @@ from .base import OTPEntry
 from .config import OTPConfig
 from .exceptions import ParseError, OTPError
 
+# Type de token -> (classe, paramètre spécifique, valeur par défaut)
+_TOKEN_TYPES = {
+    "totp": (TOTPEntry, "period", OTPConfig.DEFAULT_PERIOD),
+    "hotp": (HOTPEntry, "counter", OTPConfig.DEFAULT_COUNTER),
+}
+
+# Graphies usuelles des types de token, normalisées sans appel à lower()
+_TOKEN_TYPE_NAMES = {
+    variant: name for name in _TOKEN_TYPES for variant in (name, name.upper())
+}
+
+
+def _to_int(value: Any, param_name: str) -> int:
+    """
+    Convertit un paramètre numérique 2FAS ("6", 6, 6.0) en entier.
+
+    Mêmes règles que int(): les entiers JSON, cas courant, sont retournés
+    sans conversion.
+
+    Raises:
+        ParseError: Si int() rejette la valeur
+    """
+    if type(value) is int:
+        return value
+
+    try:
+        return int(value)
+    except (ValueError, TypeError) as e:
+        raise ParseError(
+            f"Erreur de conversion des paramètres 2FAS: {param_name}={value!r} ({e})"
+        )
+
+
+def _parse_otpauth_fields(
+    url: str,
+) -> Tuple[str, str, Optional[str], str, int, str, int]:
+    """
+    Extrait les champs d'une URL otpauth://.
+
+    Returns:
+        (type, issuer, account, secret, digits, algorithm, period ou counter)
+
+    Raises:
+        ParseError: Si l'URL est malformée
+    """
+    if not url.startswith("otpauth://"):
+        raise ParseError("L'URL doit commencer par 'otpauth://'")
+
+    # Schéma déjà vérifié: découpage direct de TYPE/LABEL?PARAMS, sans
+    # passer par urlsplit (le fragment éventuel est ignoré, comme avant)
+    rest = url[len("otpauth://") :].partition("#")[0]
+    rest, _, query = rest.partition("?")
+    otp_type, _, path = rest.partition("/")
+
+    # Extraction du type (totp/hotp)
+    otp_type = _TOKEN_TYPE_NAMES.get(otp_type) or otp_type.lower()
+    if otp_type not in _TOKEN_TYPES:
+        raise ParseError(f"Type OTP non supporté dans l'URL: {otp_type}")
+
+    # Extraction du label (path sans le /)
+    label = urllib.parse.unquote(path.lstrip("/"))
+    if not label:
+        raise ParseError("Le label est obligatoire dans l'URL otpauth")
+
+    # Découpage de la requête en une passe, sans les listes de parse_qs.
+    # Même sémantique: première occurrence retenue, valeurs vides ignorées,
+    # décodage (unquote_plus) limité aux paramètres effectivement lus
+    unquote = urllib.parse.unquote_plus
+    params: Dict[str, str] = {}
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if not value:
+            continue
+        if "%" in key or "+" in key:
+            key = unquote(key)
+        if key not in params:
+            params[key] = value
+
+    # Extraction du secret (obligatoire)
+    secret = unquote(params.get("secret", ""))
+    if not secret:
+        raise ParseError("Le paramètre 'secret' est obligatoire")
+
+    # Extraction de l'issuer et account depuis le label et les paramètres
+    issuer = unquote(params["issuer"]) if "issuer" in params else None
+    account = None
+
+    # Parse du label "issuer:account" ou juste "issuer"
+    if ":" in label:
+        label_issuer, account = label.split(":", 1)
+        if not issuer:
+            issuer = label_issuer
+    else:
+        if not issuer:
+            issuer = label
+
+    if not issuer:
+        raise ParseError("L'issuer est obligatoire")
+
+    _, param_name, param_default = _TOKEN_TYPES[otp_type]
+
+    try:
+        # Paramètres optionnels avec valeurs par défaut
+        digits = int(unquote(params.get("digits", str(OTPConfig.DEFAULT_DIGITS))))
+        # La casse de l'algorithme est normalisée par OTPEntry
+        algorithm = unquote(params.get("algorithm", OTPConfig.DEFAULT_ALGORITHM))
+        # period (totp) ou counter (hotp)
+        specific = int(unquote(params.get(param_name, str(param_default))))
+    except (ValueError, TypeError) as e:
+        raise ParseError(f"Erreur de parse des paramètres URL: {e}")
+
+    return otp_type, issuer, account, secret, digits, algorithm, specific
+
 
 class OTPFactory:
     """
@@ -22,6 +135,7 @@ class OTPFactory:
     Methods:
         create_from_dict: Crée une entrée depuis un dictionnaire générique
         create_from_2fas: Crée une entrée depuis le format 2FAS spécifique
+        create_many_from_2fas: Crée les entrées d'une liste de services 2FAS
         parse_otpauth_url: Parse une URL otpauth:// et crée l'objet OTP
     """
 
@@ -50,30 +164,22 @@ class OTPFactory:
             ... }
             >>> entry = OTPFactory.create_from_dict(data)
         """
-        otp_type = data.get("type", "totp").lower()
-
-        if otp_type == "totp":
-            return TOTPEntry(
-                issuer=data["issuer"],
-                secret=data["secret"],
-                account=data.get("account"),
-                digits=data.get("digits", OTPConfig.DEFAULT_DIGITS),
-                period=data.get("period", OTPConfig.DEFAULT_PERIOD),
-                algorithm=data.get("algorithm", OTPConfig.DEFAULT_ALGORITHM),
-            )
-
-        elif otp_type == "hotp":
-            return HOTPEntry(
-                issuer=data["issuer"],
-                secret=data["secret"],
-                account=data.get("account"),
-                digits=data.get("digits", OTPConfig.DEFAULT_DIGITS),
-                counter=data.get("counter", 0),
-                algorithm=data.get("algorithm", OTPConfig.DEFAULT_ALGORITHM),
-            )
+        otp_type = data.get("type", "totp")
+        otp_type = _TOKEN_TYPE_NAMES.get(otp_type) or otp_type.lower()
 
-        else:
+        token_spec = _TOKEN_TYPES.get(otp_type)
+        if token_spec is None:
             raise ParseError(f"Type OTP non supporté: {otp_type}")
+        entry_class, param_name, param_default = token_spec
+
+        return entry_class(
+            issuer=data["issuer"],
+            secret=data["secret"],
+            account=data.get("account"),
+            digits=data.get("digits", OTPConfig.DEFAULT_DIGITS),
+            algorithm=data.get("algorithm", OTPConfig.DEFAULT_ALGORITHM),
+            **{param_name: data.get(param_name, param_default)},
+        )
 
     @staticmethod
     def create_from_2fas(service: Dict[str, Any]) -> OTPEntry:
@@ -130,45 +236,82 @@ class OTPFactory:
         if not isinstance(otp_data, dict):
             otp_data = {}
 
+        # Méthode de lecture et valeurs par défaut résolues une seule fois
+        get = otp_data.get
+        config = OTPConfig
+
         # Issuer : priorité à otp.issuer, sinon name
-        issuer = otp_data.get("issuer", name)
+        issuer = get("issuer", name)
 
         # Account : depuis otp.account
-        account = otp_data.get("account", "")
+        account = get("account", "")
 
-        # Type de token (TOTP par défaut)
-        token_type = otp_data.get("tokenType", "TOTP").upper()
+        # Type de token (TOTP par défaut, y compris pour un type inconnu)
+        token_type = get("tokenType", "TOTP")
+        token_type = _TOKEN_TYPE_NAMES.get(token_type) or token_type.lower()
+        entry_class, param_name, param_default = _TOKEN_TYPES.get(
+            token_type, _TOKEN_TYPES["totp"]
+        )
 
         # Paramètres avec valeurs par défaut
-        digits = int(otp_data.get("digits", OTPConfig.DEFAULT_DIGITS))
-        algorithm = otp_data.get("algorithm", OTPConfig.DEFAULT_ALGORITHM).upper()
+        digits = _to_int(get("digits", config.DEFAULT_DIGITS), "digits")
+        # La casse de l'algorithme est normalisée par OTPEntry
+        algorithm = get("algorithm", config.DEFAULT_ALGORITHM)
+        specific = _to_int(get(param_name, param_default), param_name)
 
         try:
-            if token_type == "HOTP":
-                counter = int(otp_data.get("counter", OTPConfig.DEFAULT_COUNTER))
-                return HOTPEntry(
-                    issuer=issuer,
-                    secret=secret,
-                    account=account if account else None,
-                    digits=digits,
-                    counter=counter,
-                    algorithm=algorithm,
-                )
-            else:  # TOTP par défaut
-                period = int(otp_data.get("period", OTPConfig.DEFAULT_PERIOD))
-                return TOTPEntry(
-                    issuer=issuer,
-                    secret=secret,
-                    account=account if account else None,
-                    digits=digits,
-                    period=period,
-                    algorithm=algorithm,
-                )
-        except (ValueError, TypeError) as e:
-            raise ParseError(f"Erreur de conversion des paramètres 2FAS: {e}")
+            return entry_class(
+                issuer=issuer,
+                secret=secret,
+                account=account if account else None,
+                digits=digits,
+                algorithm=algorithm,
+                **{param_name: specific},
+            )
         except OTPError as e:
             raise OTPError(f"Erreur de création OTP depuis 2FAS: {e}")
 
+    @staticmethod
+    def create_many_from_2fas(
+        services: Iterable[Any],
+        on_error: Optional[Callable[[Any, Exception], None]] = None,
+    ) -> List[OTPEntry]:
+        """
+        Crée les entrées OTP d'une liste de services 2FAS en un seul parcours.
+
+        Args:
+            services: Services au format attendu par create_from_2fas
+            on_error: Appelé avec (service, exception) pour chaque service
+                      rejeté, qui est alors ignoré. Sans callback, la
+                      première erreur est propagée.
+
+        Returns:
+            Liste des entrées créées, dans l'ordre des services
+
+        Raises:
+            ParseError: Si un service est invalide et qu'aucun on_error n'est fourni
+            OTPError: Si la création d'une entrée échoue sans on_error
+
+        Example:
+            >>> entries = OTPFactory.create_many_from_2fas(backup["services"])
+        """
+        # Résolutions faites une seule fois pour tout le lot
+        create = OTPFactory.create_from_2fas
+        entries: List[OTPEntry] = []
+        append = entries.append
+
+        if on_error is None:
+            for service in services:
+                append(create(service))
+            return entries
+
+        for service in services:
+            try:
+                append(create(service))
+            except Exception as e:
+                on_error(service, e)
+        return entries
+
     @staticmethod
     def parse_otpauth_url(url: str) -> OTPEntry:
         """
@@ -189,75 +332,20 @@ class OTPFactory:
             >>> url = "otpauth://totp/GitHub:user@example.com?secret=JBSWY3DPEHPK3PXP&issuer=GitHub"
             >>> entry = OTPFactory.parse_otpauth_url(url)
         """
-        if not url.startswith("otpauth://"):
-            raise ParseError("L'URL doit commencer par 'otpauth://'")
+        otp_type, issuer, account, secret, digits, algorithm, specific = (
+            _parse_otpauth_fields(url)
+        )
+        entry_class, param_name, _ = _TOKEN_TYPES[otp_type]
 
         try:
-            # Parse l'URL
-            parsed = urllib.parse.urlparse(url)
-
-            # Extraction du type (totp/hotp)
-            otp_type = parsed.netloc.lower()
-            if otp_type not in ["totp", "hotp"]:
-                raise ParseError(f"Type OTP non supporté dans l'URL: {otp_type}")
-
-            # Extraction du label (path sans le /)
-            label = urllib.parse.unquote(parsed.path.lstrip("/"))
-            if not label:
-                raise ParseError("Le label est obligatoire dans l'URL otpauth")
-
-            # Parse des paramètres
-            params = urllib.parse.parse_qs(parsed.query)
-
-            # Extraction du secret (obligatoire)
-            secret = params.get("secret", [None])[0]
-            if not secret:
-                raise ParseError("Le paramètre 'secret' est obligatoire")
-
-            # Extraction de l'issuer et account depuis le label et les paramètres
-            issuer = params.get("issuer", [None])[0]
-            account = None
-
-            # Parse du label "issuer:account" ou juste "issuer"
-            if ":" in label:
-                label_issuer, account = label.split(":", 1)
-                if not issuer:
-                    issuer = label_issuer
-            else:
-                if not issuer:
-                    issuer = label
-
-            if not issuer:
-                raise ParseError("L'issuer est obligatoire")
-
-            # Paramètres optionnels avec valeurs par défaut
-            digits = int(params.get("digits", [OTPConfig.DEFAULT_DIGITS])[0])
-            algorithm = params.get("algorithm", [OTPConfig.DEFAULT_ALGORITHM])[
-                0
-            ].upper()
-
-            # Création selon le type
-            if otp_type == "hotp":
-                counter = int(params.get("counter", [OTPConfig.DEFAULT_COUNTER])[0])
-                return HOTPEntry(
-                    issuer=issuer,
-                    secret=secret,
-                    account=account,
-                    digits=digits,
-                    counter=counter,
-                    algorithm=algorithm,
-                )
-            else:  # totp
-                period = int(params.get("period", [OTPConfig.DEFAULT_PERIOD])[0])
-                return TOTPEntry(
-                    issuer=issuer,
-                    secret=secret,
-                    account=account,
-                    digits=digits,
-                    period=period,
-                    algorithm=algorithm,
-                )
-
+            return entry_class(
+                issuer=issuer,
+                secret=secret,
+                account=account,
+                digits=digits,
+                algorithm=algorithm,
+                **{param_name: specific},
+            )
         except (ValueError, TypeError) as e:
             raise ParseError(f"Erreur de parse des paramètres URL: {e}")
         except OTPError as e:
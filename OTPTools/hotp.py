@@ -32,6 +32,11 @@ class HOTPEntry(OTPEntry):
         otpauth://hotp/Bank:12345678?secret=JBSWY3DPEHPK3PXP&counter=43...
     """
 
+    __slots__ = ("counter",)
+
+    # Attribut de classe: lecture directe, sans appel de propriété
+    token_type = "hotp"
+
     def __init__(
         self,
         issuer: str,
@@ -57,25 +62,13 @@ class HOTPEntry(OTPEntry):
         """
         self.counter = int(counter)
         super().__init__(issuer, secret, account, digits, algorithm)
-        self._validate_hotp_params()
-
-    def _validate_hotp_params(self) -> None:
-        """
-        Valide les paramètres spécifiques au HOTP.
 
-        Raises:
-            InvalidParameterError: Si le compteur est négatif
-        """
+        # Validation spécifique au HOTP, faite directement dans __init__
         if self.counter < 0:
             raise InvalidParameterError(
                 "counter", self.counter, "Le compteur doit être positif ou nul"
             )
 
-    @property
-    def token_type(self) -> str:
-        """Retourne le type de token: 'hotp'."""
-        return "hotp"
-
     def _get_specific_params(self) -> Dict[str, str]:
         """
         Retourne les paramètres spécifiques au HOTP.
@@ -8,6 +8,14 @@ from .base import OTPEntry
 from .config import OTPConfig
 from .exceptions import InvalidParameterError
 
+# Bornes de la période, résolues une fois au chargement du module
+_MIN_PERIOD = OTPConfig.MIN_PERIOD
+_MAX_PERIOD = OTPConfig.MAX_PERIOD
+
+# Paramètres spécifiques pour la période par défaut: dictionnaire partagé,
+# à ne pas modifier
+_EMPTY_PARAMS: Dict[str, str] = {}
+
 
 class TOTPEntry(OTPEntry):
     """
@@ -30,6 +38,11 @@ class TOTPEntry(OTPEntry):
         otpauth://totp/GitHub:user@example.com?secret=JBSWY3DPEHPK3PXP&...
     """
 
+    __slots__ = ("period",)
+
+    # Attribut de classe: lecture directe, sans appel de propriété
+    token_type = "totp"
+
     def __init__(
         self,
         issuer: str,
@@ -55,34 +68,22 @@ class TOTPEntry(OTPEntry):
         """
         self.period = int(period)
         super().__init__(issuer, secret, account, digits, algorithm)
-        self._validate_totp_params()
 
-    def _validate_totp_params(self) -> None:
-        """
-        Valide les paramètres spécifiques au TOTP.
-
-        Raises:
-            InvalidParameterError: Si la période est invalide
-        """
-        if self.period < OTPConfig.MIN_PERIOD:
+        # Validation spécifique au TOTP, faite directement dans __init__
+        if self.period < _MIN_PERIOD:
             raise InvalidParameterError(
                 "period",
                 self.period,
-                f"La période doit être au minimum {OTPConfig.MIN_PERIOD} secondes",
+                f"La période doit être au minimum {_MIN_PERIOD} secondes",
             )
 
-        if self.period > OTPConfig.MAX_PERIOD:
+        if self.period > _MAX_PERIOD:
             raise InvalidParameterError(
                 "period",
                 self.period,
-                f"La période doit être au maximum {OTPConfig.MAX_PERIOD} secondes",
+                f"La période doit être au maximum {_MAX_PERIOD} secondes",
             )
 
-    @property
-    def token_type(self) -> str:
-        """Retourne le type de token: 'totp'."""
-        return "totp"
-
     def _get_specific_params(self) -> Dict[str, str]:
         """
         Retourne les paramètres spécifiques au TOTP.
@@ -93,7 +94,7 @@ class TOTPEntry(OTPEntry):
         # Ne pas inclure la période si c'est la valeur par défaut (30)
         if self.period != OTPConfig.DEFAULT_PERIOD:
             return {"period": str(self.period)}
-        return {}
+        return _EMPTY_PARAMS
 
     def to_dict(self) -> Dict[str, Any]:
         """
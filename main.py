@@ -1,9 +1,14 @@
+import hashlib
+import io
+import json
 import os
 import sys
 import argparse
+import itertools
 import logging
-import qrcode
-from typing import List, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
 
 from BackupProcessors import (
     BackupProcessorFactory,
@@ -14,8 +19,236 @@ from OTPTools import TOTPEntry, HOTPEntry
 from src.utils import generate_safe_filename
 
 
+# Au-delà de ce nombre de QR codes, le rendu est réparti sur plusieurs processus
+_PARALLEL_THRESHOLD = 16
+# QR codes envoyés par lot à chaque processus, pour limiter les échanges
+_PARALLEL_CHUNKSIZE = 8
+
+# Niveau zlib des PNG: images bicolores de quelques Ko, la compression
+# par défaut coûte plus de temps qu'elle ne fait gagner d'octets
+_PNG_COMPRESS_LEVEL = 1
+
+# Encodeur QR et tampon d'encodage réutilisés d'une entrée à l'autre
+# (un par processus)
+_qr_code = None
+_image_buffer = io.BytesIO()
+
+# Index des QR codes déjà générés (nom de fichier -> empreinte), utilisé
+# par le mode incrémental et supprimé par une génération complète. Le nom
+# et le champ "format" identifient un index écrit par cet outil.
+_INDEX_FILENAME = ".2fas-exporter-index.json"
+_INDEX_FORMAT = "2fas-exporter-index/1"
+
+
+def _render_one(
+    otpauth_url: str, output_file: str, image_format: str = "png"
+) -> None:
+    """
+    Génère et sauvegarde le QR code d'une URL otpauth.
+
+    Fonction de module pour pouvoir être exécutée par les processus du pool.
+    Le format "svg" produit une image vectorielle texte, sans compression.
+    """
+    # Import différé: qrcode (et PIL) ne sont chargés que si des QR codes
+    # sont réellement générés, pas pour --list-only
+    import qrcode
+
+    global _qr_code
+    if _qr_code is None:
+        _qr_code = qrcode.QRCode()
+
+    # Mêmes paramètres que qrcode.make(); la version est remise à zéro pour
+    # que chaque code reprenne la taille minimale adaptée à ses données
+    _qr_code.clear()
+    _qr_code.version = None
+    _qr_code.add_data(otpauth_url)
+
+    # Encodage en mémoire puis écriture en un seul appel système, au lieu
+    # des nombreuses petites écritures de PIL sur le fichier
+    buffer = _image_buffer
+    buffer.seek(0)
+    buffer.truncate()
+    if image_format == "svg":
+        import qrcode.image.svg
+
+        qr_img = _qr_code.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        qr_img.save(buffer)
+    else:
+        qr_img = _qr_code.make_image()
+        qr_img.save(buffer, format="PNG", compress_level=_PNG_COMPRESS_LEVEL)
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(output_file, flags, 0o644)
+    # Vue sans copie sur le tampon, libérée avant sa prochaine réutilisation
+    with buffer.getbuffer() as data:
+        try:
+            written = 0
+            while written < len(data):
+                written += os.write(fd, data[written:])
+        finally:
+            os.close(fd)
+
+
+def _try_render_one(
+    otpauth_url: str, output_file: str, image_format: str = "png"
+) -> Optional[Exception]:
+    """
+    Variante de _render_one qui retourne l'erreur au lieu de la lever.
+
+    Un échec n'interrompt ainsi pas le lot traité par un processus du pool.
+    """
+    try:
+        _render_one(otpauth_url, output_file, image_format)
+    except Exception as e:
+        return e
+    return None
+
+
+def _render_qr_codes(
+    urls: Dict[str, str], image_format: str = "png"
+) -> Dict[str, Exception]:
+    """
+    Génère les QR codes demandés et retourne les erreurs rencontrées.
+
+    Args:
+        urls: URL otpauth à encoder, par fichier de sortie
+        image_format: Format des images ("png" ou "svg")
+
+    Returns:
+        Exception levée pour chaque fichier en échec
+    """
+    errors: Dict[str, Exception] = {}
+    output_files = list(urls)
+    done = 0
+
+    # Rendu purement CPU et indépendant par entrée: un processus par cœur,
+    # les entrées étant distribuées par lots
+    if len(urls) > _PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+        try:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(
+                    _try_render_one,
+                    urls.values(),
+                    output_files,
+                    itertools.repeat(image_format),
+                    chunksize=_PARALLEL_CHUNKSIZE,
+                )
+                for output_file, error in zip(output_files, results):
+                    if error is not None:
+                        errors[output_file] = error
+                    done += 1
+        except (OSError, BrokenProcessPool) as e:
+            # Pool indisponible ou processus défaillant: la suite est
+            # reprise séquentiellement ci-dessous
+            logging.debug(f"Pool de processus interrompu, rendu séquentiel: {e}")
+
+    for output_file in output_files[done:]:
+        error = _try_render_one(urls[output_file], output_file, image_format)
+        if error is not None:
+            errors[output_file] = error
+
+    return errors
+
+
+def _entry_digest(otpauth_url: str, output_file: str) -> Optional[str]:
+    """
+    Empreinte d'un QR code généré, pour le reconnaître à l'exécution suivante.
+
+    L'URL (qui contient le secret) est hachée avec pour clé l'empreinte du
+    fichier: l'index ne permet pas de tester des secrets sans les images,
+    et un fichier modifié ou remplacé depuis ne correspond plus.
+
+    Returns:
+        Empreinte hexadécimale, None si le fichier est absent ou illisible
+    """
+    try:
+        with open(output_file, "rb") as f:
+            key = hashlib.blake2b(f.read()).digest()
+    except OSError:
+        return None
+    return hashlib.blake2b(
+        otpauth_url.encode("utf-8"), key=key, digest_size=16
+    ).hexdigest()
+
+
+def _load_index(index_path: str) -> Optional[Dict[str, str]]:
+    """
+    Charge l'index des QR codes générés.
+
+    Args:
+        index_path: Chemin du fichier d'index
+
+    Returns:
+        Empreinte par nom de fichier (vide si l'index est absent), ou None
+        si le fichier n'est pas un index écrit par cet outil: il ne doit
+        alors être ni utilisé, ni remplacé, ni supprimé
+    """
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning(f"⚠️  Index {index_path} illisible, laissé en place: {e}")
+        return None
+
+    if (
+        not isinstance(index, dict)
+        or index.get("format") != _INDEX_FORMAT
+        or not isinstance(index.get("files"), dict)
+    ):
+        logging.warning(f"⚠️  {index_path} n'est pas un index de QR codes, ignoré")
+        return None
+
+    return index["files"]
+
+
+def _save_index(index_path: str, files: Dict[str, str]) -> None:
+    """
+    Enregistre l'index des QR codes générés (remplacement atomique).
+
+    Args:
+        index_path: Chemin du fichier d'index
+        files: Empreinte par nom de fichier
+    """
+    temp_path = f"{index_path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": _INDEX_FORMAT, "files": files}, f, indent=2, sort_keys=True
+            )
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        logging.warning(f"⚠️  Impossible d'enregistrer l'index {index_path}: {e}")
+    finally:
+        # Fichier temporaire restant si l'écriture ou le remplacement a échoué
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _remove_index(index_path: str) -> None:
+    """Supprime l'index, qui ne décrit plus les fichiers après leur réécriture.
+
+    Seul un index écrit par cet outil est supprimé.
+    """
+    if not os.path.exists(index_path) or _load_index(index_path) is None:
+        return
+    try:
+        os.remove(index_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"⚠️  Impossible de supprimer l'index {index_path}: {e}")
+
+
 def generate_qr_codes_from_entries(
-    entries: List[Union[TOTPEntry, HOTPEntry]], output_dir: str, verbose: bool = False
+    entries: List[Union[TOTPEntry, HOTPEntry]],
+    output_dir: str,
+    verbose: bool = False,
+    image_format: str = "png",
+    incremental: bool = False,
 ):
     """
     Génère les QR codes pour une liste d'entrées OTP.
@@ -24,6 +257,12 @@ def generate_qr_codes_from_entries(
         entries: Liste d'objets OTPEntry (TOTP ou HOTP)
         output_dir: Répertoire de sortie pour les QR codes
         verbose: Affichage détaillé des opérations
+        image_format: Format des images, "png" (défaut) ou "svg"
+        incremental: Ne régénère pas les QR codes dont le fichier et l'URL
+                     n'ont pas changé depuis la dernière exécution
+                     incrémentale (suivi dans .2fas-exporter-index.json
+                     du dossier de sortie, que toute génération complète
+                     supprime)
     """
     # Créer le dossier de sortie
     os.makedirs(output_dir, exist_ok=True)
@@ -31,28 +270,75 @@ def generate_qr_codes_from_entries(
     success_count = 0
     error_count = 0
 
-    for entry in entries:
-        try:
-            # Générer le QR code
-            qr_img = qrcode.make(entry.otpauth)
-
-            # Générer le nom de fichier sécurisé
-            safe_filename = generate_safe_filename(entry.issuer, entry.account)
-            output_file = os.path.join(output_dir, f"{safe_filename}.png")
-
-            # Sauvegarder l'image
-            with open(output_file, "wb") as f:
-                qr_img.save(f)
+    # Générer les noms de fichier sécurisés. Le préfixe du dossier (avec son
+    # séparateur) n'est calculé qu'une fois: les noms assainis ne contiennent
+    # aucun séparateur, une simple concaténation suffit
+    prefix = os.path.join(output_dir, "")
+    output_files = [
+        f"{prefix}{generate_safe_filename(entry.issuer, entry.account)}.{image_format}"
+        for entry in entries
+    ]
+
+    # À nom de fichier identique, la dernière entrée l'emporte, comme lors
+    # d'une génération séquentielle; chaque fichier n'est écrit qu'une fois
+    urls = {
+        output_file: entry.otpauth for entry, output_file in zip(entries, output_files)
+    }
+
+    # Mode incrémental: seuls les fichiers absents, modifiés ou dont l'URL
+    # a changé sont générés. Une génération complète réécrit les fichiers
+    # sans tenir l'index à jour: il est supprimé avant toute écriture.
+    index_path = f"{prefix}{_INDEX_FILENAME}"
+    names = {output_file: output_file[len(prefix) :] for output_file in urls}
+    index = _load_index(index_path) if incremental else None
+    unchanged = set()
+    if index is not None:
+        unchanged = {
+            output_file
+            for output_file, url in urls.items()
+            if names[output_file] in index
+            and index[names[output_file]] == _entry_digest(url, output_file)
+        }
+    elif not incremental:
+        _remove_index(index_path)
+
+    errors = _render_qr_codes(
+        {f: url for f, url in urls.items() if f not in unchanged}, image_format
+    )
 
+    if index is not None:
+        # Index reconstruit à partir de cette seule exécution: les entrées
+        # retirées du backup ou en échec n'y figurent plus
+        new_index = {}
+        for output_file, url in urls.items():
+            name = names[output_file]
+            if output_file in unchanged:
+                new_index[name] = index[name]
+            elif output_file not in errors:
+                digest = _entry_digest(url, output_file)
+                if digest is not None:
+                    new_index[name] = digest
+        _save_index(index_path, new_index)
+
+    for entry, output_file in zip(entries, output_files):
+        error = errors.get(output_file)
+        if error is None:
             success_count += 1
 
-            if verbose:
-                logging.info(f"✅ QR code pour {entry.label} sauvegardé: {output_file}")
-
-        except Exception as e:
+            if verbose and output_file in unchanged:
+                logging.info(
+                    "♻️  QR code pour %s inchangé: %s", entry.label, output_file
+                )
+            elif verbose:
+                logging.info(
+                    "✅ QR code pour %s sauvegardé: %s", entry.label, output_file
+                )
+        else:
             error_count += 1
             logging.error(
-                f"❌ Erreur lors de la génération du QR code pour {entry.label}: {e}"
+                "❌ Erreur lors de la génération du QR code pour %s: %s",
+                entry.label,
+                error,
             )
 
     # Résumé final
@@ -73,15 +359,18 @@ def list_entries(entries: List[Union[TOTPEntry, HOTPEntry]]):
         print("Aucune entrée OTP trouvée dans le backup.")
         return
 
-    print(f"\n📱 {len(entries)} entrée(s) OTP trouvée(s):")
-    print("-" * 50)
+    # Lignes assemblées puis écrites en une fois, plutôt qu'un print() par
+    # entrée
+    separator = "-" * 50
+    lines = [f"\n📱 {len(entries)} entrée(s) OTP trouvée(s):", separator]
 
     for i, entry in enumerate(entries, 1):
-        entry_type = "TOTP" if isinstance(entry, TOTPEntry) else "HOTP"
+        entry_type = entry.token_type.upper()
         account_info = f" ({entry.account})" if entry.account else ""
-        print(f"{i:2d}. [{entry_type}] {entry.issuer}{account_info}")
+        lines.append(f"{i:2d}. [{entry_type}] {entry.issuer}{account_info}")
 
-    print("-" * 50)
+    lines.append(separator)
+    print("\n".join(lines))
 
 
 def main():
@@ -94,6 +383,7 @@ Examples:
   %(prog)s backup.2fas ./qr_codes --verbose          # Verbose output
   %(prog)s backup.zip ./qr_codes --format 2fas       # Force 2FAS format
   %(prog)s backup.json ./qr_codes --list-only        # List entries only
+  %(prog)s backup.2fas ./qr_codes --image-format svg # SVG instead of PNG
         """,
     )
 
@@ -117,6 +407,17 @@ Examples:
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "svg"],
+        default="png",
+        help="Image format of the generated QR codes (default: png)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip QR codes whose file exists and whose entry is unchanged",
+    )
     parser.add_argument(
         "--list-only",
         action="store_true",
@@ -138,12 +439,15 @@ Examples:
         # Choisir le processor selon le format
         if args.format == "2fas":
             processor = TwoFASProcessor()
-            if not processor.can_process(args.backup_file):
-                logging.error(
-                    f"❌ File '{args.backup_file}' is not a valid 2FAS backup."
-                )
-                sys.exit(1)
-            entries = processor.process_backup(args.backup_file)
+            try:
+                if not processor.can_process(args.backup_file):
+                    logging.error(
+                        f"❌ File '{args.backup_file}' is not a valid 2FAS backup."
+                    )
+                    sys.exit(1)
+                entries = processor.process_backup(args.backup_file)
+            finally:
+                processor.close()
         else:  # auto-detection
             factory = BackupProcessorFactory()
             entries = factory.process_backup(args.backup_file)
@@ -163,22 +467,29 @@ Examples:
             )
             sys.exit(1)
 
-        if not os.path.exists(args.destination_folder):
-            try:
-                os.makedirs(args.destination_folder, exist_ok=True)
-                if args.verbose:
-                    logging.info(
-                        f"📁 Dossier de destination créé: {args.destination_folder}"
-                    )
-            except Exception as e:
-                logging.error(f"❌ Failed to create destination directory: {e}")
-                sys.exit(1)
+        # Création directe: un dossier déjà présent est signalé par
+        # FileExistsError, sans vérification préalable de son existence
+        try:
+            os.makedirs(args.destination_folder)
+            if args.verbose:
+                logging.info(
+                    f"📁 Dossier de destination créé: {args.destination_folder}"
+                )
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logging.error(f"❌ Failed to create destination directory: {e}")
+            sys.exit(1)
 
         # Génération des QR codes
         if entries:
             logging.info(f"🚀 Génération des QR codes dans {args.destination_folder}")
             generate_qr_codes_from_entries(
-                entries, args.destination_folder, args.verbose
+                entries,
+                args.destination_folder,
+                args.verbose,
+                args.image_format,
+                args.incremental,
             )
         else:
             logging.warning("⚠️  Aucune entrée OTP valide trouvée dans le backup")
@@ -5,10 +5,39 @@ Ce module contient les fonctions utilitaires communes utilisées
 pour la génération et la sauvegarde des QR codes.
 """
 
+import functools
 import os
 import re
 import unicodedata
 
+# Caractères interdits remplacés par des tirets, en une passe (str.translate)
+# Windows: < > : " | ? * \ /
+# Unix: /
+_FORBIDDEN_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', "-"))
+_WHITESPACE_RE = re.compile(r"\s+")
+# Ce qu'un nom déjà propre ne contient pas: caractère interdit, espace,
+# point en début ou fin
+_UNCLEAN_RE = re.compile(r'[<>:"/\\|?*\s]|^\.|\.$')
+
+# Translittération précalculée des caractères latins accentués (Latin-1 et
+# Latin étendu A/B): même résultat que NFKD + suppression du non-ASCII,
+# caractère par caractère, sans décomposition à chaque appel
+_LATIN_TO_ASCII = str.maketrans(
+    {
+        chr(code): unicodedata.normalize("NFKD", chr(code))
+        .encode("ascii", "ignore")
+        .decode("ascii")
+        for code in range(0x80, 0x250)
+    }
+)
+
+# Noms de fichiers réservés sous Windows
+_RESERVED_NAMES = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+
 
 def sanitize_filename(filename):
     """
@@ -23,17 +52,34 @@ def sanitize_filename(filename):
     if not filename:
         return "unknown"
 
-    # Normalise les caractères Unicode (ex: é -> e)
-    filename = unicodedata.normalize("NFKD", filename)
-    filename = filename.encode("ascii", "ignore").decode("ascii")
+    # Cas courant ("GitHub"): nom déjà propre, renvoyé tel quel
+    if (
+        filename.isascii()
+        and len(filename) <= 200
+        and _UNCLEAN_RE.search(filename) is None
+        and filename.upper() not in _RESERVED_NAMES
+    ):
+        return filename
+
+    return _sanitize_filename(filename)
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_filename(filename):
+    """Assainit un nom non vide; mis en cache, les émetteurs se répétant."""
+    # Normalise les caractères Unicode (ex: é -> e): table pour les
+    # caractères latins, NFKD seulement s'il reste des caractères non ASCII
+    if not filename.isascii():
+        filename = filename.translate(_LATIN_TO_ASCII)
+        if not filename.isascii():
+            filename = unicodedata.normalize("NFKD", filename)
+            filename = filename.encode("ascii", "ignore").decode("ascii")
 
     # Remplace les caractères interdits par des tirets
-    # Windows: < > : " | ? * \ /
-    # Unix: /
-    filename = re.sub(r'[<>:"/\\|?*]', "-", filename)
+    filename = filename.translate(_FORBIDDEN_CHARS)
 
     # Supprime les espaces en début/fin et remplace les espaces multiples
-    filename = re.sub(r"\s+", "_", filename.strip())
+    filename = _WHITESPACE_RE.sub("_", filename.strip())
 
     # Supprime les points en début/fin (problématique sur Windows)
     filename = filename.strip(".")
@@ -43,32 +89,7 @@ def sanitize_filename(filename):
         filename = filename[:200]
 
     # Évite les noms réservés Windows
-    reserved_names = {
-        "CON",
-        "PRN",
-        "AUX",
-        "NUL",
-        "COM1",
-        "COM2",
-        "COM3",
-        "COM4",
-        "COM5",
-        "COM6",
-        "COM7",
-        "COM8",
-        "COM9",
-        "LPT1",
-        "LPT2",
-        "LPT3",
-        "LPT4",
-        "LPT5",
-        "LPT6",
-        "LPT7",
-        "LPT8",
-        "LPT9",
-    }
-
-    if filename.upper() in reserved_names:
+    if filename.upper() in _RESERVED_NAMES:
         filename = f"_{filename}"
 
     # Si le nom est vide après nettoyage
@@ -78,10 +99,14 @@ def sanitize_filename(filename):
     return filename
 
 
+@functools.lru_cache(maxsize=1024)
 def generate_safe_filename(issuer, account):
     """
     Génère un nom de fichier sécurisé pour un QR code OTP.
 
+    Le résultat ne dépend que des arguments: il est mis en cache, les
+    backups contenant souvent plusieurs comptes d'un même émetteur.
+
     Args:
         issuer (str): Émetteur du service
         account (str): Compte utilisateur (peut être None/vide)
@@ -8,9 +8,14 @@ pour s'assurer qu'il n'y a pas de régression.
 
 import sys
 import os
+import base64
+import hashlib
 import tempfile
 import json
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from unittest import mock
 
 # Ajouter le répertoire racine au path pour les imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,8 +23,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from OTPTools.factory import OTPFactory
 from OTPTools import TOTPEntry, HOTPEntry
 from OTPTools.exceptions import OTPError, ParseError
-from BackupProcessors import BackupProcessorFactory, TwoFASProcessor
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from BackupProcessors import (
+    BackupProcessorFactory,
+    CorruptedBackupError,
+    TwoFASProcessor,
+)
 from src.utils import sanitize_filename, generate_safe_filename
+from main import generate_qr_codes_from_entries, _render_qr_codes
+import main as exporter
 
 
 def test_otpfactory_create_from_2fas():
@@ -65,6 +78,13 @@ def test_otpfactory_create_from_2fas():
         assert isinstance(entry, HOTPEntry)
         assert entry.issuer == "Service HOTP"
         assert entry.counter == 5
+        assert "counter=5" in entry.otpauth
+        entry.increment_counter()
+        assert "counter=6" in entry.otpauth
+        # Une affectation directe est aussi prise en compte
+        entry.counter = 9
+        entry.digits = 8
+        assert "digits=8" in entry.otpauth and "counter=9" in entry.otpauth
         print("  ✅ HOTP créé avec succès")
     except Exception as e:
         print(f"  ❌ Erreur HOTP: {e}")
@@ -82,6 +102,52 @@ def test_otpfactory_create_from_2fas():
         print(f"  ❌ Erreur service minimal: {e}")
         return False
 
+    # Test paramètre numérique invalide: ParseError explicite
+    try:
+        OTPFactory.create_from_2fas(
+            {"secret": "JBSWY3DPEHPK3PXP", "name": "X", "otp": {"digits": "six"}}
+        )
+        print("  ❌ digits invalide accepté")
+        return False
+    except ParseError:
+        print("  ✅ digits invalide rejeté")
+
+    # Conversion selon int(), comme le format 2FAS historique: flottant
+    # tronqué, chaîne numérique acceptée, valeur hors domaine en OTPError
+    entry = OTPFactory.create_from_2fas(
+        {"secret": "JBSWY3DPEHPK3PXP", "name": "X", "otp": {"digits": 6.5}}
+    )
+    assert entry.digits == 6
+    entry = OTPFactory.create_from_2fas(
+        {"secret": "JBSWY3DPEHPK3PXP", "name": "X", "otp": {"period": " 60 "}}
+    )
+    assert entry.period == 60
+    try:
+        OTPFactory.create_from_2fas(
+            {"secret": "JBSWY3DPEHPK3PXP", "name": "X", "otp": {"digits": "1_0"}}
+        )
+        print("  ❌ digits hors domaine accepté")
+        return False
+    except ParseError:
+        print("  ❌ digits hors domaine signalé comme erreur de conversion")
+        return False
+    except OTPError:
+        print("  ✅ Conversion numérique identique à int()")
+
+    # Test création par lot: l'invalide est signalé puis ignoré
+    try:
+        rejected = []
+        entries = OTPFactory.create_many_from_2fas(
+            [service_totp, {"name": "Sans secret"}, service_hotp],
+            on_error=lambda service, error: rejected.append(service["name"]),
+        )
+        assert [type(e) for e in entries] == [TOTPEntry, HOTPEntry]
+        assert rejected == ["Sans secret"]
+        print("  ✅ Création par lot réussie")
+    except Exception as e:
+        print(f"  ❌ Erreur création par lot: {e}")
+        return False
+
     return True
 
 
@@ -178,6 +244,141 @@ def test_backup_processor_factory():
     return True
 
 
+def test_twofas_can_process_detection():
+    """Test de la détection rapide de format par TwoFASProcessor.can_process()."""
+    print("🧪 Test TwoFASProcessor.can_process()...")
+
+    processor = TwoFASProcessor()
+    service = {"secret": "JBSWY3DPEHPK3PXP", "name": "GitHub"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backup_file = os.path.join(temp_dir, "backup.2fas")
+        with open(backup_file, "w", encoding="utf-8") as f:
+            json.dump({"schemaVersion": 4, "services": [service]}, f)
+
+        list_file = os.path.join(temp_dir, "services.json")
+        with open(list_file, "w", encoding="utf-8") as f:
+            json.dump([service], f)
+
+        # Signature au-delà de l'en-tête lu: repli sur la validation complète
+        padded_file = os.path.join(temp_dir, "padded.json")
+        with open(padded_file, "w", encoding="utf-8") as f:
+            json.dump({"name": "x" * 8192, **service}, f)
+
+        other_file = os.path.join(temp_dir, "other.json")
+        with open(other_file, "w", encoding="utf-8") as f:
+            json.dump({"foo": "bar"}, f)
+
+        zip_file = os.path.join(temp_dir, "backup.zip")
+        with zipfile.ZipFile(zip_file, "w") as archive:
+            archive.write(backup_file, "backup.json")
+
+        empty_zip = os.path.join(temp_dir, "empty.zip")
+        with zipfile.ZipFile(empty_zip, "w") as archive:
+            archive.writestr("readme.txt", "rien ici")
+
+        expectations = [
+            (backup_file, True),
+            (list_file, True),
+            (padded_file, True),
+            (other_file, False),
+            (zip_file, True),
+            (empty_zip, False),
+            (os.path.join(temp_dir, "missing.2fas"), False),
+        ]
+
+        for file_path, expected in expectations:
+            result = processor.can_process(file_path)
+            if result != expected:
+                print(
+                    f"  ❌ can_process('{os.path.basename(file_path)}') = {result}, attendu {expected}"
+                )
+                return False
+
+        entries = processor.process_backup(zip_file)
+        processor.close()
+        if len(entries) != 1 or entries[0].issuer != "GitHub":
+            print(f"  ❌ Extraction ZIP inattendue: {entries}")
+            return False
+
+        # Les services d'un membre au nom de fichier annexe sont exportés
+        metadata_zip = os.path.join(temp_dir, "metadata.zip")
+        with zipfile.ZipFile(metadata_zip, "w") as archive:
+            archive.write(backup_file, "backup.json")
+            archive.writestr(
+                "metadata.json",
+                json.dumps({"services": [{"secret": "ABCDEFGHIJKLMNOP", "name": "Bank"}]}),
+            )
+        entries = processor.process_backup(metadata_zip)
+        processor.close()
+        if sorted(e.issuer for e in entries) != ["Bank", "GitHub"]:
+            print(f"  ❌ Membre metadata.json ignoré: {entries}")
+            return False
+
+        # La factory ferme les archives ouvertes une fois le backup traité
+        factory = BackupProcessorFactory()
+        assert len(factory.process_backup(zip_file)) == 1
+        if any(p._zip_cache for p in factory._processors):
+            print("  ❌ Archive ZIP restée ouverte après process_backup")
+            return False
+
+    print("  ✅ Détection de format fonctionne correctement")
+    return True
+
+
+def _encrypt_2fas_blob(plaintext: bytes, password: str) -> str:
+    """Chiffre des données au format 2FAS `data:salt:iv` (PBKDF2 + AES-GCM)."""
+    salt = os.urandom(16)
+    iv = os.urandom(12)
+    key = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 10_000, 32)
+    data = AESGCM(key).encrypt(iv, plaintext, None)
+    return ":".join(base64.b64encode(part).decode("ascii") for part in (data, salt, iv))
+
+
+def test_twofas_encrypted_backup():
+    """Test du déchiffrement d'un backup 2FAS chiffré par mot de passe."""
+    print("🧪 Test backup 2FAS chiffré...")
+
+    services = [
+        {"secret": "JBSWY3DPEHPK3PXP", "name": "GitHub", "otp": {"tokenType": "TOTP"}},
+        {"secret": "ABCDEFGHIJKLMNOP", "name": "Bank", "otp": {"tokenType": "HOTP"}},
+    ]
+    backup = {
+        "schemaVersion": 4,
+        "services": [],
+        "servicesEncrypted": _encrypt_2fas_blob(
+            json.dumps(services).encode("utf-8"), "secret-password"
+        ),
+        "reference": _encrypt_2fas_blob(b"reference", "secret-password"),
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backup_file = os.path.join(temp_dir, "encrypted.2fas")
+        with open(backup_file, "w", encoding="utf-8") as f:
+            json.dump(backup, f)
+
+        # Mot de passe prérenseigné pour éviter la saisie interactive
+        processor = TwoFASProcessor()
+        processor._cached_password = "secret-password"
+        entries = processor.process_backup(backup_file)
+        if [e.issuer for e in entries] != ["GitHub", "Bank"]:
+            print(f"  ❌ Entrées déchiffrées inattendues: {entries}")
+            return False
+        print("  ✅ Backup chiffré déchiffré avec succès")
+
+        processor = TwoFASProcessor()
+        processor._cached_password = "wrong-password"
+        try:
+            processor.process_backup(backup_file)
+        except CorruptedBackupError:
+            print("  ✅ Mot de passe invalide détecté")
+        else:
+            print("  ❌ Mot de passe invalide accepté")
+            return False
+
+    return True
+
+
 def test_utils_functions():
     """Test des fonctions utilitaires."""
     print("🧪 Test des fonctions utilitaires...")
@@ -257,6 +458,158 @@ def test_qr_code_generation():
     return True
 
 
+def test_generate_qr_code_files():
+    """Test d'écriture des QR codes PNG, noms en double compris."""
+    print("🧪 Test de génération des fichiers QR code...")
+
+    entries = [
+        TOTPEntry(issuer="GitHub", secret="JBSWY3DPEHPK3PXP", account="a@x.org"),
+        HOTPEntry(issuer="Bank", secret="JBSWY3DPEHPK3PXP", counter=3),
+        TOTPEntry(issuer="GitHub", secret="JBSWY3DPEHPK3PXP", account="a@x.org"),
+    ]
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_qr_codes_from_entries(entries, temp_dir)
+
+            files = sorted(os.listdir(temp_dir))
+            assert files == ["Bank.png", "GitHub_a@x.org.png"], files
+            for name in files:
+                with open(os.path.join(temp_dir, name), "rb") as f:
+                    assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+        print("  ✅ Fichiers PNG générés correctement")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_qr_codes_from_entries(entries[:1], temp_dir, image_format="svg")
+
+            assert os.listdir(temp_dir) == ["GitHub_a@x.org.svg"]
+            with open(os.path.join(temp_dir, "GitHub_a@x.org.svg"), "rb") as f:
+                assert b"<svg" in f.read()
+        print("  ✅ Fichier SVG généré correctement")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_qr_codes_from_entries(entries[:2], temp_dir, incremental=True)
+            github_file = os.path.join(temp_dir, "GitHub_a@x.org.png")
+            bank_file = os.path.join(temp_dir, "Bank.png")
+            for path in (github_file, bank_file):
+                os.utime(path, ns=(0, 0))
+
+            # Seule l'entrée modifiée est régénérée
+            changed = HOTPEntry(issuer="Bank", secret="JBSWY3DPEHPK3PXP", counter=4)
+            generate_qr_codes_from_entries(
+                [entries[0], changed], temp_dir, incremental=True
+            )
+            assert os.stat(github_file).st_mtime_ns == 0
+            assert os.stat(bank_file).st_mtime_ns != 0
+
+            # Les noms absents de l'exécution sont retirés de l'index
+            index_file = os.path.join(temp_dir, ".2fas-exporter-index.json")
+            generate_qr_codes_from_entries([entries[0]], temp_dir, incremental=True)
+            with open(index_file, "r", encoding="utf-8") as f:
+                assert list(json.load(f)["files"]) == ["GitHub_a@x.org.png"]
+
+            # Une génération complète supprime l'index: un retour aux données
+            # précédentes régénère le fichier réécrit entre-temps
+            generate_qr_codes_from_entries([changed], temp_dir)
+            assert not os.path.exists(index_file)
+            generate_qr_codes_from_entries(entries[:2], temp_dir, incremental=True)
+            os.utime(bank_file, ns=(0, 0))
+            generate_qr_codes_from_entries([changed], temp_dir)
+            generate_qr_codes_from_entries(entries[:2], temp_dir, incremental=True)
+            assert os.stat(bank_file).st_mtime_ns != 0
+
+            # Un fichier du même nom qui n'est pas un index est conservé
+            with open(index_file, "w", encoding="utf-8") as f:
+                json.dump({"notes": "à garder"}, f)
+            generate_qr_codes_from_entries(entries[:2], temp_dir)
+            generate_qr_codes_from_entries(entries[:2], temp_dir, incremental=True)
+            with open(index_file, "r", encoding="utf-8") as f:
+                assert json.load(f) == {"notes": "à garder"}
+            assert not os.path.exists(index_file + ".tmp")
+        print("  ✅ Génération incrémentale correcte")
+    except Exception as e:
+        print(f"  ❌ Erreur génération fichiers: {e}")
+        return False
+
+    return True
+
+
+class _PartialExecutor:
+    """Pool factice: rend les premiers QR codes puis simule un processus perdu."""
+
+    chunksizes = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, func, *iterables, chunksize=1):
+        self.chunksizes.append(chunksize)
+        for done, args in enumerate(zip(*iterables)):
+            if done == 3:
+                raise BrokenProcessPool("processus perdu")
+            yield func(*args)
+
+
+def test_parallel_qr_rendering():
+    """Test du rendu réparti sur un pool de processus et de ses replis."""
+    print("🧪 Test du rendu parallèle des QR codes...")
+
+    url = TOTPEntry(issuer="GitHub", secret="JBSWY3DPEHPK3PXP").otpauth
+    count = exporter._PARALLEL_THRESHOLD + 2
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        urls = {os.path.join(temp_dir, f"{i}.png"): url for i in range(count)}
+        # Une entrée en échec (dossier absent) n'interrompt pas son lot
+        bad_file = os.path.join(temp_dir, "absent", "bad.png")
+        urls[bad_file] = url
+
+        try:
+            # Pool réel, même sur une machine à un seul cœur
+            with mock.patch.object(exporter.os, "cpu_count", return_value=4):
+                errors = _render_qr_codes(urls)
+            assert list(errors) == [bad_file], errors
+            assert isinstance(errors[bad_file], FileNotFoundError)
+            assert len(os.listdir(temp_dir)) == count
+            print("  ✅ Pool de processus: entrée en échec isolée")
+
+            # Processus perdu en cours de route: la suite est rendue en série
+            for path in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, path))
+            _PartialExecutor.chunksizes = []
+            with mock.patch.object(
+                exporter.os, "cpu_count", return_value=4
+            ), mock.patch.object(exporter, "ProcessPoolExecutor", _PartialExecutor):
+                errors = _render_qr_codes(urls)
+            assert _PartialExecutor.chunksizes == [exporter._PARALLEL_CHUNKSIZE]
+            assert list(errors) == [bad_file], errors
+            assert len(os.listdir(temp_dir)) == count
+            print("  ✅ Repli séquentiel après BrokenProcessPool")
+
+            # Pool indisponible: tout est rendu en série
+            for path in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, path))
+            with mock.patch.object(
+                exporter.os, "cpu_count", return_value=4
+            ), mock.patch.object(
+                exporter, "ProcessPoolExecutor", side_effect=OSError("pas de pool")
+            ):
+                errors = _render_qr_codes(urls)
+            assert list(errors) == [bad_file], errors
+            assert len(os.listdir(temp_dir)) == count
+            print("  ✅ Repli séquentiel sans pool de processus")
+        except Exception as e:
+            print(f"  ❌ Erreur rendu parallèle: {e!r}")
+            return False
+
+    return True
+
+
 def main():
     """Lance tous les tests de validation."""
     print("🚀 Début des tests de validation du refactoring...")
@@ -266,8 +619,12 @@ def main():
         test_otpfactory_create_from_2fas,
         test_otpfactory_parse_otpauth_url,
         test_backup_processor_factory,
+        test_twofas_can_process_detection,
+        test_twofas_encrypted_backup,
         test_utils_functions,
         test_qr_code_generation,
+        test_generate_qr_code_files,
+        test_parallel_qr_rendering,
     ]
 
     passed = 0